@@ -22,6 +22,8 @@ import time
 from typing import Optional, Tuple, Any
 import queue
 
+from config import JPEG_QUALITY
+
 
 class CameraHandler:
     """Gerencia a captura de vídeo da câmera."""
@@ -65,8 +67,14 @@ class CameraHandler:
             True se inicializou com sucesso, False caso contrário
         """
         try:
+            # Idempotente: abrir um dispositivo V4L2/Pi camera custa até ~2s;
+            # se a câmera já está aberta, reutiliza o handle existente.
+            if self.is_initialized and self.cap is not None and self.cap.isOpened():
+                self.logger.debug("Câmera já inicializada; reutilizando handle")
+                return True
+
             self.logger.info(f"Inicializando câmera {self.camera_index}")
-            
+
             # Inicializa captura de vídeo
             self.cap = cv2.VideoCapture(self.camera_index)
             
@@ -223,21 +231,23 @@ class CameraHandler:
         except queue.Empty:
             return None
             
-    def encode_frame(self, frame: np.ndarray, format: str = '.jpg', quality: int = 85) -> Tuple[bool, np.ndarray]:
+    def encode_frame(self, frame: np.ndarray, format: str = '.jpg', quality: int = JPEG_QUALITY) -> Tuple[bool, np.ndarray]:
         """
         Codifica frame para transmissão.
-        
+
         Args:
             frame: Frame a ser codificado
             format: Formato de codificação (.jpg, .png)
-            quality: Qualidade da compressão (1-100 para JPEG)
-            
+            quality: Qualidade da compressão (1-100 para JPEG, default JPEG_QUALITY)
+
         Returns:
             Tupla (sucesso, dados_codificados)
         """
         try:
             if format.lower() == '.jpg' or format.lower() == '.jpeg':
-                encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+                # Otimização Huffman desligada: encode mais rápido em troca de
+                # poucos % de tamanho — bom trade-off para frames transitórios.
+                encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
             elif format.lower() == '.png':
                 encode_params = [cv2.IMWRITE_PNG_COMPRESSION, 9]
             else:
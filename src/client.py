@@ -13,17 +13,55 @@ Por que usar linha delimitada por "\n"?
 """
 
 import socket
+import sys
 import json
 import time
 import threading
-import logging
-import base64
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 import os
-import argparse
-import os
+import protocol
 from config import SERVER_HOST, SERVER_PORT, LOG_DIR, LBPH_THRESHOLD
 
+try:
+    # pybase64 usa SIMD (AVX2/SSSE3/NEON) no encode/decode — ~5-10x mais rápido
+    # que a stdlib nos JPEGs de centenas de KB que trafegam no protocolo
+    import pybase64 as b64
+except ImportError:
+    # Fallback sem dependências: binascii expõe as mesmas funções C que o
+    # módulo base64 chama por baixo, sem o wrapper Python nem o tratamento
+    # de quebra de linha MIME — ~2x mais rápido que base64.b64encode
+    import binascii
+
+    class _BinasciiB64:
+        """Adapta binascii à API b64encode/b64decode usada no cliente."""
+
+        @staticmethod
+        def b64encode(data):
+            return binascii.b2a_base64(data, newline=False)
+
+        b64decode = staticmethod(binascii.a2b_base64)
+
+    b64 = _BinasciiB64
+
+
+# Menu estático composto uma única vez; cada iteração do loop interativo faz
+# uma única escrita em vez de 11 prints (um encode + lock de stdio por linha).
+_MENU = "\n".join([
+    "\n📋 MENU DE OPÇÕES:",
+    "1. 🔍 Reconhecer face",
+    "2. ➕ Adicionar face conhecida",
+    "3. 👥 Listar faces conhecidas",
+    "4. 🏓 Ping",
+    "5. �️ Treinar modelo (LBPH)",
+    "6. 🤖 Reconhecer e identificar (LBPH)",
+    "7. 🧹 Limpar modelo",
+    "8. 🔐 Autorizar acesso (votação 2/3)",
+    "9. � Sair",
+]) + "\n"
+
 
 class FacialRecognitionClient:
     """Cliente para comunicação com o servidor de reconhecimento facial."""
@@ -44,31 +82,88 @@ class FacialRecognitionClient:
         # Thread para recebimento de mensagens
         self.receive_thread: Optional[threading.Thread] = None
         self.stop_receiving = threading.Event()
+        # Serializa escritas no socket (menu + fluxos em lote podem concorrer)
+        self._send_lock = threading.Lock()
+
+        # Escrita de imagens em disco fora da thread de recepção: ela apenas
+        # decodifica e enfileira; uma thread dedicada faz o I/O, evitando que
+        # um disco lento pause a leitura do socket por dezenas de ms.
+        self._io_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._io_thread = threading.Thread(target=self._disk_writer_loop, daemon=True)
+        self._io_thread.start()
+
+        # Diretório de snapshots criado uma única vez; _save_image não precisa
+        # pagar um stat/mkdir por imagem recebida
+        self._images_dir = "captured_images"
+        os.makedirs(self._images_dir, exist_ok=True)
         # Sinalização para fluxos síncronos (coleta guiada)
         self._dataset_event = threading.Event()
         self._dataset_result: Optional[Dict[str, Any]] = None
-        
-        # Configuração de logging
-        self._setup_logging()
-        
+
+        # Despacho de mensagens do servidor: dict construído uma vez em vez
+        # de uma cascata if/elif percorrida a cada mensagem recebida
+        self._handlers = self._build_handlers()
+
+        # Símbolos dos caminhos quentes de saída: emoji só quando stdout é um
+        # TTY. Com stdout redirecionado (CI, scraping de log) cada emoji custa
+        # 4 bytes de encode UTF-8 por linha sem ninguém para vê-lo.
+        self._tty = sys.stdout.isatty()
+        if self._tty:
+            self._sym = {
+                'ok': '✅', 'err': '❌', 'unk': '❓', 'search': '🔍',
+                'stats': '📊', 'none': '👻', 'save': '💾', 'pong': '🏓',
+            }
+        else:
+            self._sym = {
+                'ok': '[OK]', 'err': '[ERR]', 'unk': '[?]', 'search': '[REC]',
+                'stats': '[N]', 'none': '[--]', 'save': '[SAVE]', 'pong': '[PONG]',
+            }
+
+        # Logging inicializado só no primeiro acesso a self.logger: importar
+        # logging (muitos submódulos) no __init__ encarece cada invocação
+        # curta do cliente sem necessidade
+        self._logger = None
+
+    @property
+    def logger(self):
+        """Logger do cliente, configurado preguiçosamente no primeiro uso."""
+        if self._logger is None:
+            self._setup_logging()
+        return self._logger
+
     def _setup_logging(self) -> None:
         """Configura o sistema de logging."""
+        # Import adiado: o módulo logging só entra no processo se o cliente
+        # de fato logar algo (conexão, erro), não no import de client.py
+        import logging
+        import logging.handlers
+
         # Garante diretório de logs
         try:
             os.makedirs(LOG_DIR, exist_ok=True)
         except Exception:
             pass
 
+        # Os handlers reais (arquivo + console) ficam atrás de um QueueListener
+        # em thread própria: um logger.info na thread de recebimento vira só um
+        # put na fila, sem bloquear o socket em I/O de disco.
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(os.path.join(LOG_DIR, 'client.log'))
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(os.path.join(LOG_DIR, 'client.log')),
-                logging.StreamHandler()
-            ]
+            handlers=[logging.handlers.QueueHandler(log_queue)]
         )
-        self.logger = logging.getLogger(__name__)
-        
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        self._logger = logging.getLogger(__name__)
+
     def connect(self) -> bool:
         """
         Conecta ao servidor.
@@ -81,7 +176,15 @@ class FacialRecognitionClient:
             
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(10.0)  # Timeout de 10 segundos
-            
+
+            # TCP_NODELAY: protocolo é request/response com mensagens pequenas;
+            # sem isso o Nagle pode segurar até 40ms cada JSON curto.
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Buffers de 1 MiB: os resultados carregam JPEGs de centenas de KB;
+            # o default do kernel limita a vazão dessas mensagens grandes.
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+
             self.socket.connect((self.host, self.port))
             self.is_connected = True
             
@@ -115,31 +218,72 @@ class FacialRecognitionClient:
         
     def _receive_messages(self) -> None:
         """Thread para receber mensagens do servidor."""
-        recv_buffer = b""
+        recv_buffer = bytearray()
+        # Buffer fixo reutilizado pelo recv_into: cada leitura escreve direto
+        # nele, em vez de alocar um bytes novo por recv(4096). Dimensionado ao
+        # SO_RCVBUF efetivo do socket: um único syscall pode drenar tudo que o
+        # kernel acumulou (welcome + pong + resultado chegando em rajada).
+        try:
+            bufsize = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        except OSError:
+            bufsize = 64 * 1024
+        chunk = bytearray(max(64 * 1024, bufsize))
+        chunk_view = memoryview(chunk)
         while not self.stop_receiving.is_set() and self.is_connected:
             try:
                 if not self.socket:
                     break
 
-                data = self.socket.recv(4096)
-                if not data:
+                n = self.socket.recv_into(chunk_view)
+                if n == 0:
                     self.logger.warning("Conexão fechada pelo servidor")
                     break
 
-                recv_buffer += data
+                recv_buffer += chunk_view[:n]
 
-                # Processa todas as mensagens completas (terminadas com \n)
-                # Mesma lógica do servidor: acumulamos bytes até encontrar "\n".
-                while b"\n" in recv_buffer:
-                    line, recv_buffer = recv_buffer.split(b"\n", 1)
+                # Processa todas as mensagens completas (terminadas com \n).
+                # Em vez de split (que checa com 'in', varre de novo e realoca o
+                # buffer a cada mensagem — O(N²) em rajadas), um único find por
+                # linha avança o cursor e o buffer é compactado uma vez ao final.
+                scan_pos = 0
+                while True:
+                    nl = recv_buffer.find(b"\n", scan_pos)
+                    if nl < 0:
+                        break
+                    line = bytes(recv_buffer[scan_pos:nl])
                     if not line.strip():
+                        scan_pos = nl + 1
                         continue
                     try:
-                        message = json.loads(line.decode('utf-8'))
-                        self._handle_server_message(message)
-                    except json.JSONDecodeError as e:
+                        # Campo image_data (maior campo do protocolo) é extraído
+                        # dos bytes crus antes do parse: o base64 vai direto do
+                        # buffer para o decodificador, sem virar str intermediária
+                        line, image_bytes = self._extract_image_data(line)
+                        # protocol.loads aceita bytes direto: com orjson não há
+                        # a passada intermediária de decode UTF-8 para str
+                        message = protocol.loads(line)
+                    except protocol.JSONDecodeError as e:
                         self.logger.error(f"Erro ao decodificar mensagem: {e}")
+                        scan_pos = nl + 1
                         continue
+                    # Frame binário: "image_len" anuncia um JPEG cru logo após
+                    # o '\n' (sem base64 no fio). Se o blob ainda não chegou
+                    # inteiro, a linha fica no buffer para a próxima leitura.
+                    blob_len = message.pop("image_len", 0)
+                    if blob_len:
+                        end = nl + 1 + blob_len
+                        if len(recv_buffer) < end:
+                            break
+                        image_bytes = bytes(recv_buffer[nl + 1:end])
+                        scan_pos = end
+                    else:
+                        scan_pos = nl + 1
+                    if image_bytes is not None:
+                        message["image_data"] = image_bytes
+                    self._handle_server_message(message)
+                if scan_pos:
+                    # Descarta de uma vez tudo que já foi consumido
+                    del recv_buffer[:scan_pos]
             except socket.timeout:
                 continue
             except Exception as e:
@@ -149,83 +293,136 @@ class FacialRecognitionClient:
                 
         self.is_connected = False
         
+    @staticmethod
+    def _extract_image_data(line: bytes):
+        """
+        Extrai e decodifica o campo image_data direto dos bytes da linha.
+
+        Deixar o decodificador JSON materializar ~700 KB de base64 como str
+        para logo em seguida reconverter em bytes custa ~3x o payload em
+        alocações transitórias. Como o valor é base64 puro (sem aspas ou
+        escapes no alfabeto), basta localizar o span entre aspas com find e
+        decodificar a fatia via memoryview; o JSON restante (pequeno) é
+        parseado com o valor esvaziado.
+
+        Returns:
+            Tupla (linha com image_data esvaziado, bytes da imagem ou None)
+        """
+        key = line.find(b'"image_data"')
+        if key < 0:
+            return line, None
+        colon = line.find(b':', key + 12)
+        start = line.find(b'"', colon + 1) + 1
+        end = line.find(b'"', start)
+        if colon < 0 or start <= 0 or end <= start:
+            return line, None
+        try:
+            image_bytes = b64.b64decode(memoryview(line)[start:end])
+        except ValueError:
+            # O span entre aspas não era base64 (valor null, "image_data"
+            # dentro de outra string etc.); binascii.Error herda de ValueError,
+            # então pybase64 e os fallbacks caem aqui. Devolve a linha intacta
+            # e deixa o parse JSON normal tratar o caso.
+            return line, None
+        return line[:start] + line[end:], image_bytes
+
     def _handle_server_message(self, message: Dict[str, Any]) -> None:
         """
         Processa mensagens recebidas do servidor.
-        
+
+        O roteamento usa o dict _handlers construído no __init__: uma busca
+        de hash em vez da cascata de comparações de string que rodava a cada
+        mensagem na thread de recepção.
+
         Args:
             message: Mensagem do servidor
         """
         message_type = message.get("type", "unknown")
-        
-        if message_type == "welcome":
-            print(f"\n🎉 {message.get('message', 'Conectado')}")
-            
-        elif message_type == "recognition_result":
-            self._handle_recognition_result(message)
-            
-        elif message_type == "image_captured":
-            print(f"\n📸 Imagem capturada às {time.ctime(message.get('timestamp', time.time()))}")
-            
-        elif message_type == "face_added":
-            print(f"\n✅ {message.get('message', 'Face adicionada')}")
-            
-        elif message_type == "known_faces_list":
-            self._handle_faces_list(message)
-
-        elif message_type == "model_trained":
-            ok = message.get('success', False)
-            print(f"\n🛠️ Treino de modelo: {'✅ OK' if ok else '❌ Falhou'}")
-            faces = message.get('known_faces', [])
-            dataset_counts = message.get('dataset_counts', {})
-            total_images = message.get('total_images', 0)
-            if faces:
-                print("   👥 Pessoas no modelo:")
-                for i, n in enumerate(faces, 1):
-                    count = dataset_counts.get(n, 0)
-                    print(f"   {i}. {n}  (📷 {count} imagens)")
-            if total_images:
-                print(f"   🗂️ Total de imagens no dataset: {total_images}")
-            
-        elif message_type == "pong":
-            print(f"\n🏓 Pong recebido - Latência: {time.time() - message.get('timestamp', 0):.3f}s")
-            
-        elif message_type == "error":
-            print(f"\n❌ Erro: {message.get('message', 'Erro desconhecido')}")
-
-        elif message_type == "dataset_collected":
-            saved = message.get('saved', 0)
-            requested = message.get('requested', 0)
-            name = message.get('name', '')
-            print(f"\n📥 Coleta de dataset para '{name}': {saved}/{requested} imagens salvas")
-            # Sinaliza para fluxos que aguardam coleta
-            self._dataset_result = message
-            self._dataset_event.set()
-
-        elif message_type == "prediction_result":
-            self._handle_prediction_result(message)
-
-        elif message_type == "access_decision":
-            self._handle_access_decision(message)
-            
+        self._handlers.get(message_type, self._on_unknown)(message)
+
+    def _build_handlers(self) -> Dict[str, Any]:
+        """Tabela tipo-de-mensagem → método tratador."""
+        return {
+            "welcome": self._on_welcome,
+            "recognition_result": self._handle_recognition_result,
+            "image_captured": self._on_image_captured,
+            "face_added": self._on_face_added,
+            "known_faces_list": self._handle_faces_list,
+            "model_trained": self._on_model_trained,
+            "pong": self._on_pong,
+            "error": self._on_error,
+            "dataset_collected": self._on_dataset_collected,
+            "prediction_result": self._handle_prediction_result,
+            "access_decision": self._handle_access_decision,
+        }
+
+    def _on_welcome(self, message: Dict[str, Any]) -> None:
+        print(f"\n🎉 {message.get('message', 'Conectado')}")
+
+    def _on_image_captured(self, message: Dict[str, Any]) -> None:
+        print(f"\n📸 Imagem capturada às {time.ctime(message.get('timestamp', time.time()))}")
+
+    def _on_face_added(self, message: Dict[str, Any]) -> None:
+        print(f"\n✅ {message.get('message', 'Face adicionada')}")
+
+    def _on_model_trained(self, message: Dict[str, Any]) -> None:
+        ok = message.get('success', False)
+        print(f"\n🛠️ Treino de modelo: {'✅ OK' if ok else '❌ Falhou'}")
+        faces = message.get('known_faces', [])
+        dataset_counts = message.get('dataset_counts', {})
+        total_images = message.get('total_images', 0)
+        if faces:
+            print("   👥 Pessoas no modelo:")
+            for i, n in enumerate(faces, 1):
+                count = dataset_counts.get(n, 0)
+                print(f"   {i}. {n}  (📷 {count} imagens)")
+        if total_images:
+            print(f"   🗂️ Total de imagens no dataset: {total_images}")
+
+    def _on_pong(self, message: Dict[str, Any]) -> None:
+        if "client_ts_ns" in message:
+            latency = (time.monotonic_ns() - message["client_ts_ns"]) / 1e9
+        elif "client_ts" in message:
+            latency = time.monotonic() - message["client_ts"]
         else:
-            print(f"\n📨 Mensagem recebida: {message}")
+            # Compatibilidade com servidores antigos (usa relógio de parede do servidor)
+            latency = time.time() - message.get('timestamp', 0)
+        print(f"\n{self._sym['pong']} Pong recebido - Latência: {latency:.3f}s")
+
+    def _on_error(self, message: Dict[str, Any]) -> None:
+        print(f"\n{self._sym['err']} Erro: {message.get('message', 'Erro desconhecido')}")
+
+    def _on_dataset_collected(self, message: Dict[str, Any]) -> None:
+        saved = message.get('saved', 0)
+        requested = message.get('requested', 0)
+        name = message.get('name', '')
+        print(f"\n📥 Coleta de dataset para '{name}': {saved}/{requested} imagens salvas")
+        # Sinaliza para fluxos que aguardam coleta
+        self._dataset_result = message
+        self._dataset_event.set()
+
+    def _on_unknown(self, message: Dict[str, Any]) -> None:
+        print(f"\n📨 Mensagem recebida: {message}")
             
     def _handle_recognition_result(self, message: Dict[str, Any]) -> None:
         """Processa resultado de reconhecimento facial."""
         faces = message.get('recognized_faces', [])
         confidence_scores = message.get('confidence_scores', [])
-        
-        print(f"\n🔍 Resultado do Reconhecimento:")
-        print(f"   📊 Faces detectadas: {len(faces)}")
-        
+
+        # Saída montada em memória e emitida em uma única escrita: um print por
+        # face significa um lock de stdio + syscall por linha na thread de
+        # recepção; juntar tudo reduz para uma escrita por resultado.
+        sym = self._sym
+        lines = [f"\n{sym['search']} Resultado do Reconhecimento:",
+                 f"   {sym['stats']} Faces detectadas: {len(faces)}"]
         if faces:
             for i, (face, confidence) in enumerate(zip(faces, confidence_scores)):
-                status = "✅" if face != "Desconhecido" else "❓"
-                print(f"   {status} Face {i+1}: {face} (Confiança: {confidence:.2f})")
+                status = sym['ok'] if face != "Desconhecido" else sym['unk']
+                lines.append(f"   {status} Face {i+1}: {face} (Confiança: {confidence:.2f})")
         else:
-            print("   👻 Nenhuma face detectada")
-            
+            lines.append(f"   {sym['none']} Nenhuma face detectada")
+        sys.stdout.write("\n".join(lines) + "\n")
+
         # Salva imagem se disponível
         image_data = message.get('image_data')
         if image_data:
@@ -243,24 +440,32 @@ class FacialRecognitionClient:
         else:
             print("   📭 Nenhuma face conhecida registrada")
             
-    def _save_image(self, image_data: str, filename: str) -> None:
-        """Salva imagem recebida do servidor."""
+    def _save_image(self, image_data, filename: str) -> None:
+        """Agenda gravação de imagem recebida do servidor (I/O em thread própria)."""
         try:
-            # Decodifica base64
-            image_bytes = base64.b64decode(image_data)
-            
-            # Cria diretório se não existir
-            os.makedirs("captured_images", exist_ok=True)
-            
-            # Salva arquivo
-            filepath = os.path.join("captured_images", filename)
-            with open(filepath, 'wb') as f:
-                f.write(image_bytes)
-                
-            print(f"   💾 Imagem salva: {filepath}")
-            
+            # Aceita bytes já decodificados (caminho rápido do _extract_image_data)
+            # ou str base64 (diretório já garantido no __init__)
+            if isinstance(image_data, (bytes, bytearray)):
+                image_bytes = image_data
+            else:
+                image_bytes = b64.b64decode(image_data)
+
+            filepath = os.path.join(self._images_dir, filename)
+            self._io_queue.put((filepath, image_bytes))
+
         except Exception as e:
             self.logger.error(f"Erro ao salvar imagem: {e}")
+
+    def _disk_writer_loop(self) -> None:
+        """Consome a fila de gravações e escreve os arquivos em disco."""
+        while True:
+            filepath, image_bytes = self._io_queue.get()
+            try:
+                with open(filepath, 'wb') as f:
+                    f.write(image_bytes)
+                print(f"   {self._sym['save']} Imagem salva: {filepath}")
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar {filepath}: {e}")
             
     def send_message(self, message: Dict[str, Any]) -> bool:
         """
@@ -277,80 +482,160 @@ class FacialRecognitionClient:
             return False
             
         try:
-            data = json.dumps(message).encode('utf-8') + b"\n"
-            self.socket.sendall(data)
+            data = protocol.dumps(message) + b"\n"
+            with self._send_lock:
+                self.socket.sendall(data)
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Erro ao enviar mensagem: {e}")
             return False
+
+    def send_message_parts(self, *parts: bytes) -> bool:
+        """
+        Envia um frame já serializado, fornecido em múltiplos buffers.
+
+        Usa socket.sendmsg (scatter-gather/writev): o kernel junta os pedaços
+        na escrita, dispensando a cópia O(n) de concatenar header + payload em
+        um único bytes no userland. Em plataformas sem sendmsg (ex.: Windows)
+        cai no sendall com concatenação.
+
+        Returns:
+            True se enviou com sucesso, False caso contrário
+        """
+        if not self.is_connected or not self.socket:
+            print("❌ Não conectado ao servidor")
+            return False
+
+        try:
+            with self._send_lock:
+                if hasattr(self.socket, "sendmsg"):
+                    total = sum(len(p) for p in parts)
+                    sent = self.socket.sendmsg(parts)
+                    while sent < total:
+                        # Short write (raro): reenvia só o restante, ainda em
+                        # scatter-gather — fatia por memoryview, sem concatenar
+                        skip = sent
+                        iov = []
+                        for p in parts:
+                            if skip >= len(p):
+                                skip -= len(p)
+                                continue
+                            iov.append(memoryview(p)[skip:] if skip else p)
+                            skip = 0
+                        sent += self.socket.sendmsg(iov)
+                else:
+                    self.socket.sendall(b"".join(parts))
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Erro ao enviar mensagem em partes: {e}")
+            return False
             
     def request_face_recognition(self) -> None:
         """Solicita reconhecimento facial."""
-        message = {
-            "type": "recognize_face",
-            "timestamp": time.time()
-        }
-        
-        if self.send_message(message):
+        if self._send_simple("recognize_face"):
             print("🔍 Solicitação de reconhecimento enviada...")
         else:
             print("❌ Falha ao enviar solicitação de reconhecimento")
-            
+
     def request_image_capture(self) -> None:
         """Solicita captura de imagem."""
-        message = {
-            "type": "capture_image",
-            "timestamp": time.time()
-        }
-        
-        if self.send_message(message):
+        if self._send_simple("capture_image"):
             print("📸 Solicitação de captura enviada...")
         else:
             print("❌ Falha ao enviar solicitação de captura")
             
+    # Mensagens de formato fixo: o prefixo JSON é serializado uma única vez na
+    # classe e só o timestamp é concatenado a cada envio — nenhum dict nem
+    # json.dumps no caminho dessas requisições simples.
+    _SIMPLE_PREFIXES = {
+        "ping": b'{"type": "ping", "timestamp": ',
+        "recognize_face": b'{"type": "recognize_face", "timestamp": ',
+        "capture_image": b'{"type": "capture_image", "timestamp": ',
+        "list_known_faces": b'{"type": "list_known_faces", "timestamp": ',
+    }
+
+    def _send_simple(self, msg_type: str, extra: bytes = b'') -> bool:
+        """Envia mensagem de formato fixo usando o prefixo pré-serializado."""
+        if not self.is_connected or not self.socket:
+            print("❌ Não conectado ao servidor")
+            return False
+        try:
+            data = (self._SIMPLE_PREFIXES[msg_type]
+                    + f"{time.time():.6f}".encode('ascii') + extra + b'}\n')
+            with self._send_lock:
+                self.socket.sendall(data)
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao enviar mensagem: {e}")
+            return False
+
+    # Bloco múltiplo de 3: cada chunk codifica sem padding intermediário,
+    # então os pedaços podem ser concatenados direto no buffer de saída.
+    _B64_CHUNK = 48 * 1024
+
+    def _encode_file_base64(self, image_path: str) -> bytes:
+        """Codifica um arquivo em base64 lendo em blocos de 48 KB.
+
+        Evita materializar o arquivo inteiro + uma str intermediária: o
+        resultado é escrito direto em um bytearray pré-alocado no tamanho
+        final (4/3 do arquivo), cortando as cópias transitórias do caminho
+        de upload de imagens.
+        """
+        size = os.stat(image_path).st_size
+        out = bytearray(((size + 2) // 3) * 4)
+        view = memoryview(out)
+        pos = 0
+        with open(image_path, 'rb') as f:
+            while True:
+                chunk = f.read(self._B64_CHUNK)
+                if not chunk:
+                    break
+                enc = b64.b64encode(chunk)
+                view[pos:pos + len(enc)] = enc
+                pos += len(enc)
+        return bytes(view[:pos])
+
     def add_known_face_from_file(self, name: str, image_path: str) -> None:
         """Adiciona face conhecida a partir de arquivo."""
+        if not self.is_connected or not self.socket:
+            print("❌ Não conectado ao servidor")
+            return
         try:
-            # Lê arquivo de imagem
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-                
-            message = {
-                "type": "add_known_face",
-                "name": name,
-                "image_data": image_data,
-                "timestamp": time.time()
-            }
-            
-            if self.send_message(message):
+            encoded = self._encode_file_base64(image_path)
+
+            # O envelope é montado por partes: o campo image_data (de longe o
+            # maior) nunca passa por json.dumps nem vira str — só o nome, que
+            # pode conter acentos/aspas, é serializado pelo codificador JSON.
+            header = (b'{"type": "add_known_face", "name": '
+                      + json.dumps(name, ensure_ascii=False).encode('utf-8')
+                      + b', "image_data": "')
+            tail = b'", "timestamp": ' + f"{time.time():.6f}".encode('ascii') + b'}\n'
+
+            if self.send_message_parts(header, encoded, tail):
                 print(f"📤 Enviando face de {name}...")
             else:
                 print("❌ Falha ao enviar face")
-                
+
         except Exception as e:
-            print(f"❌ Erro ao ler arquivo {image_path}: {e}")
+            self.logger.error(f"Erro ao enviar face de {name}: {e}")
+            print(f"❌ Erro ao enviar arquivo {image_path}: {e}")
             
     def list_known_faces(self) -> None:
         """Lista faces conhecidas."""
-        message = {
-            "type": "list_known_faces",
-            "timestamp": time.time()
-        }
-        
-        if self.send_message(message):
+        if self._send_simple("list_known_faces"):
             print("📋 Solicitando lista de faces conhecidas...")
         else:
             print("❌ Falha ao solicitar lista")
-            
+
     def send_ping(self) -> None:
         """Envia ping para testar conectividade."""
-        message = {
-            "type": "ping",
-            "timestamp": time.time()
-        }
-        
-        if self.send_message(message):
+        # Relógio monotônico local, ecoado pelo servidor no pong; a latência
+        # é medida no mesmo relógio, imune a skew/ajustes do relógio de parede.
+        # Inteiro de monotonic_ns: serializa sem passar pelo dtoa de float.
+        extra = b', "client_ts_ns": ' + str(time.monotonic_ns()).encode('ascii')
+        if self._send_simple("ping", extra=extra):
             print("🏓 Ping enviado...")
         else:
             print("❌ Falha ao enviar ping")
@@ -362,17 +647,8 @@ class FacialRecognitionClient:
         print("="*50)
         
         while self.is_connected:
-            print("\n📋 MENU DE OPÇÕES:")
-            print("1. 🔍 Reconhecer face")
-            print("2. ➕ Adicionar face conhecida")
-            print("3. 👥 Listar faces conhecidas")
-            print("4. 🏓 Ping")
-            print("5. �️ Treinar modelo (LBPH)")
-            print("6. 🤖 Reconhecer e identificar (LBPH)")
-            print("7. 🧹 Limpar modelo")
-            print("8. 🔐 Autorizar acesso (votação 2/3)")
-            print("9. � Sair")
-            
+            sys.stdout.write(_MENU)
+
             try:
                 choice = input("\n👆 Escolha uma opção (1-9): ").strip()
                 
@@ -574,13 +850,21 @@ class FacialRecognitionClient:
                 print("📂 Pasta não contém imagens suportadas (.jpg, .jpeg, .png, .bmp)")
                 return
             print(f"📤 Enviando {len(files)} imagens de '{dir_path}' para '{name}'...")
+            paths = [os.path.join(dir_path, f) for f in files]
+
+            # Ler + codificar base64 é trabalho independente por arquivo e o
+            # encoder C (pybase64/binascii) solta o GIL: o pool escala com os
+            # núcleos. Só o envio fica serial, preservando a ordem das imagens
+            # no socket — o _send_lock já garante que frames não se misturam.
+            header = (b'{"type": "add_known_face", "name": '
+                      + json.dumps(name, ensure_ascii=False).encode('utf-8')
+                      + b', "image_data": "')
             sent = 0
-            for f in files:
-                full = os.path.join(dir_path, f)
-                self.add_known_face_from_file(name, full)
-                sent += 1
-                # pequeno intervalo para não saturar o socket
-                time.sleep(0.05)
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+                for encoded in ex.map(self._encode_file_base64, paths):
+                    tail = b'", "timestamp": ' + f"{time.time():.6f}".encode('ascii') + b'}\n'
+                    if self.send_message_parts(header, encoded, tail):
+                        sent += 1
             print(f"✅ Envio concluído: {sent} imagens enviadas para '{name}'.")
         except Exception as e:
             print(f"❌ Erro ao enviar pasta: {e}")
@@ -588,6 +872,9 @@ class FacialRecognitionClient:
 
 def main():
     """Função principal do cliente."""
+    # argparse só é necessário quando o módulo roda como script
+    import argparse
+
     parser = argparse.ArgumentParser(description="Cliente do servidor de reconhecimento facial")
     parser.add_argument("--host", default=SERVER_HOST, help=f"Endereço do servidor (default: {SERVER_HOST})")
     parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"Porta do servidor (default: {SERVER_PORT})")
@@ -28,6 +28,10 @@ CAMERA_INDEX: int = int(os.getenv("CAMERA_INDEX", "0"))
 CAMERA_WIDTH: int = int(os.getenv("CAMERA_WIDTH", "640"))
 CAMERA_HEIGHT: int = int(os.getenv("CAMERA_HEIGHT", "480"))
 
+# Qualidade JPEG dos frames transmitidos/salvos (1-100). 80 é visualmente
+# suficiente para snapshots e bem mais rápido/menor que o default 95 do OpenCV.
+JPEG_QUALITY: int = int(os.getenv("JPEG_QUALITY", "80"))
+
 # Paths
 MODELS_DIR: str = os.getenv("MODELS_DIR", "models")
 DATA_DIR: str = os.getenv("DATA_DIR", "data")
@@ -36,6 +40,16 @@ LOG_DIR: str = os.getenv("LOG_DIR", "logs")
 # Reconhecimento (LBPH)
 LBPH_THRESHOLD: float = float(os.getenv("LBPH_THRESHOLD", "55"))
 
+# Cadência da detecção: roda o Haar Cascade a cada N chamadas de predict(),
+# reaproveitando as caixas da última detecção nos frames intermediários (o LBPH
+# continua rodando no frame atual). 1 = detectar sempre.
+LBPH_DETECT_EVERY: int = int(os.getenv("LBPH_DETECT_EVERY", "2"))
+
+# Fator de redução aplicado ao frame antes da detecção Haar (0 < fator <= 1).
+# O custo do detectMultiScale cresce com a quantidade de pixels; detectar em
+# meia resolução e re-escalar as caixas dá o mesmo resultado prático bem mais rápido.
+DETECT_DOWNSCALE: float = float(os.getenv("DETECT_DOWNSCALE", "0.5"))
+
 # Modo estrito (verificação adicional para reduzir falsos positivos)
 # Se habilitado, a autorização só é concedida se a média das distâncias dos frames
 # reconhecidos ficar abaixo de um limiar mais severo.
@@ -21,13 +21,14 @@ import cv2
 import numpy as np
 import os
 import base64
+import hashlib
 import logging
+import threading
 from typing import List, Dict, Any, Optional, Tuple
-from PIL import Image
-import io
 import json
 import time
-from config import MODELS_DIR, DATA_DIR, LBPH_THRESHOLD
+from concurrent.futures import ThreadPoolExecutor
+from config import MODELS_DIR, DATA_DIR, LBPH_THRESHOLD, DETECT_DOWNSCALE, LBPH_DETECT_EVERY
 
 
 class FaceRecognitionHandler:
@@ -42,11 +43,55 @@ class FaceRecognitionHandler:
         self.training_data_dir = DATA_DIR
         self.lbph_model_file = os.path.join(self.models_dir, "opencv_lbph.xml")
         self.lbph_labels_file = os.path.join(self.models_dir, "lbph_labels.json")
+        self.image_hashes_file = os.path.join(self.models_dir, "image_hashes.json")
         self.lbph_threshold = LBPH_THRESHOLD
 
+        # Hashes das imagens já cadastradas, por pessoa: permite descartar
+        # uploads duplicados antes de decodificar/detectar/re-treinar. A chave
+        # é o nome porque a mesma foto cadastrada sob outro nome é um cadastro
+        # legítimo (novo label), não uma duplicata.
+        self._image_hashes: Dict[str, set] = self._load_image_hashes()
+
         # Estado de labels
         self.label_to_name: Dict[int, str] = {}
         self.name_to_label: Dict[str, int] = {}
+        # Assinatura do dataset usado no último treino (evita re-treino desnecessário)
+        self._trained_signature: str = ""
+
+        # Cadência de detecção: caixas da última detecção reaproveitadas nos
+        # frames intermediários (ver LBPH_DETECT_EVERY no config)
+        self._predict_calls: int = 0
+        self._last_boxes: List[Tuple[int, int, int, int]] = []
+        # Frame cinza anterior, usado pelo fluxo óptico para deslocar as
+        # caixas nos frames em que o detector não roda
+        self._last_gray: Optional[np.ndarray] = None
+
+        # Buffer cinza reutilizado entre frames do predict: com resolução
+        # estável da câmera, cvtColor escreve via dst= sempre no mesmo
+        # ndarray em vez de alocar H*W bytes por frame
+        self._gray_buf: Optional[np.ndarray] = None
+        # Idem para o frame anotado de draw_face_rectangles
+        self._annot_buf: Optional[np.ndarray] = None
+        # predict() roda em threads do pool do servidor (predict direto e o
+        # laço de votação do authorize_access): o lock protege _gray_buf e o
+        # estado de rastreio (_predict_calls/_last_boxes/_last_gray), que são
+        # compartilhados. O trabalho pesado é C++ que solta o GIL de qualquer
+        # forma, então serializar o predict aqui custa pouco.
+        self._predict_lock = threading.Lock()
+
+        # Detector DNN (YuNet) opcional: mais rápido e preciso que o Haar,
+        # mas exige o modelo ONNX em models/ e um OpenCV com FaceDetectorYN.
+        # Na ausência de qualquer um dos dois, o Haar Cascade segue valendo.
+        self.face_detector_dnn = None
+        yunet_path = os.path.join(self.models_dir, "face_detection_yunet_2023mar.onnx")
+        if hasattr(cv2, 'FaceDetectorYN') and os.path.exists(yunet_path):
+            try:
+                self.face_detector_dnn = cv2.FaceDetectorYN.create(
+                    yunet_path, "", (0, 0), 0.6, 0.3, 5000)
+                self.logger.info("Detector YuNet (DNN) habilitado")
+            except Exception as e:
+                self.logger.error(f"Falha ao carregar YuNet, usando Haar: {e}")
+                self.face_detector_dnn = None
 
         # Detector (Haar Cascade)
         cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
@@ -54,6 +99,16 @@ class FaceRecognitionHandler:
         if self.face_cascade.empty():
             self.logger.error("Falha ao carregar Haar Cascade para faces")
 
+        # T-API/OpenCL: com uma iGPU/GPU disponível, resize e detectMultiScale
+        # têm kernels OpenCL e rodam fora da CPU quando alimentados com UMat.
+        # Sem OpenCL, tudo segue no caminho numpy normal.
+        try:
+            self._use_umat = bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+        except Exception:
+            self._use_umat = False
+        if self._use_umat:
+            self.logger.info("OpenCL disponível: detecção usará UMat")
+
         # Reconhecedor LBPH
         if hasattr(cv2, 'face') and hasattr(cv2.face, 'LBPHFaceRecognizer_create'):
             self.recognizer = cv2.face.LBPHFaceRecognizer_create()
@@ -79,43 +134,125 @@ class FaceRecognitionHandler:
         """Decodifica imagem, detecta face, salva recorte cinza em data/<name>/ e (opcional) re-treina."""
         try:
             image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
-            image_array = np.array(image)
-            if image_array.ndim == 2:  # grayscale
-                bgr = cv2.cvtColor(image_array, cv2.COLOR_GRAY2BGR)
-            else:
-                # Pillow dá RGB; convertemos para BGR
-                bgr = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
 
-            face_roi = self._extract_face_region(bgr)
-            if face_roi is None:
+            # Curto-circuito por conteúdo: imagem idêntica já cadastrada PARA
+            # ESTA PESSOA não precisa passar de novo por detecção, gravação e
+            # re-treino. Sob outro nome, a mesma imagem segue o fluxo normal.
+            image_hash = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+            if image_hash in self._image_hashes.get(name, ()):
+                self.logger.info(f"Imagem duplicada ignorada para {name} (hash {image_hash[:8]})")
+                return True
+
+            # cv2.imdecode decodifica direto para um ndarray BGR contíguo
+            # (SIMD, sem o round-trip PIL → np.array → cvtColor); IMREAD_COLOR
+            # já entrega 3 canais mesmo para fontes em tons de cinza
+            bgr = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if bgr is None:
+                self.logger.warning(f"Imagem inválida para {name}")
+                return False
+
+            # Converte para cinza uma única vez: o mesmo buffer serve para a
+            # detecção e para o recorte salvo no dataset (antes o ROI BGR era
+            # convertido de novo após a detecção)
+            gray_full = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+            faces = self._detect_faces(bgr, gray=gray_full)
+            if not faces:
                 self.logger.warning(f"Nenhuma face detectada para {name}")
                 return False
-            gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
+            x, y, w, h = faces[0]
+            gray = gray_full[y:y + h, x:x + w]
             person_dir = os.path.join(self.training_data_dir, name)
             os.makedirs(person_dir, exist_ok=True)
             filename = os.path.join(person_dir, f"{int(time.time()*1000)}.jpg")
             cv2.imwrite(filename, gray)
             self.logger.info(f"Imagem salva para {name}: {filename}")
+            self._image_hashes.setdefault(name, set()).add(image_hash)
+            self._save_image_hashes()
             if self.recognizer is not None:
-                self.train_model()
+                # Pessoa já conhecida: o LBPH aceita treino incremental
+                # (update), que só processa a imagem nova — o re-treino
+                # completo fica para nomes inéditos (novo label)
+                if self._is_trained() and name in self.name_to_label:
+                    self._update_lbph_incremental(gray, name)
+                else:
+                    self.train_model()
             return True
         except Exception as e:
             self.logger.error(f"Erro ao adicionar face {name}: {e}")
             return False
+
+    def _load_image_hashes(self) -> Dict[str, set]:
+        try:
+            if os.path.exists(self.image_hashes_file):
+                with open(self.image_hashes_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return {name: set(hashes) for name, hashes in data.items()}
+                # Formato antigo (lista plana, sem nome): não dá para atribuir
+                # os hashes a pessoas, então descarta — no pior caso uma
+                # duplicata é reprocessada uma vez e o cache se refaz.
+        except Exception as e:
+            self.logger.error(f"Falha ao carregar hashes de imagens: {e}")
+        return {}
+
+    def _save_image_hashes(self) -> None:
+        try:
+            with open(self.image_hashes_file, 'w', encoding='utf-8') as f:
+                json.dump({name: sorted(hashes)
+                           for name, hashes in self._image_hashes.items()}, f)
+        except Exception as e:
+            self.logger.error(f"Falha ao salvar hashes de imagens: {e}")
             
     # ===== Detecção & Predição =====
         
-    def _detect_faces(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    def _detect_faces(self, image: np.ndarray,
+                      gray: Optional[np.ndarray] = None) -> List[Tuple[int, int, int, int]]:
         if self.face_cascade is None:
             return []
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
-            return [(x, y, w, h) for x, y, w, h in faces]
+            if self.face_detector_dnn is not None:
+                return self._detect_dnn(image)
+            # Chamadores que já converteram o frame passam o gray pronto,
+            # evitando uma segunda varredura de H*W*3 bytes sobre a imagem
+            if gray is None:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return self._detect_on_gray(gray, scale_factor=1.1, min_neighbors=5, min_size=30)
         except Exception as e:
             self.logger.error(f"Detecção falhou: {e}")
             return []
+
+    def _detect_dnn(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detecta faces com o YuNet (entrada BGR, saída em caixas x,y,w,h)."""
+        h, w = image.shape[:2]
+        self.face_detector_dnn.setInputSize((w, h))
+        _, dets = self.face_detector_dnn.detect(image)
+        if dets is None:
+            return []
+        return [(max(0, int(x)), max(0, int(y)), int(bw), int(bh))
+                for x, y, bw, bh in dets[:, :4]]
+
+    def _detect_on_gray(self, gray: np.ndarray, scale_factor: float, min_neighbors: int,
+                        min_size: int) -> List[Tuple[int, int, int, int]]:
+        """Roda o Haar Cascade em versão reduzida do frame e re-escala as caixas.
+
+        Detectar em DETECT_DOWNSCALE da resolução corta o custo do
+        detectMultiScale proporcionalmente aos pixels; os recortes (ROI) para o
+        LBPH continuam sendo feitos na imagem original, então não há perda.
+        """
+        # Com OpenCL, o resize e o detector rodam sobre UMat na GPU; o
+        # resultado do detectMultiScale volta como ndarray de retângulos
+        src = cv2.UMat(gray) if self._use_umat else gray
+        scale = DETECT_DOWNSCALE
+        if 0.0 < scale < 1.0:
+            small = cv2.resize(src, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            small, scale = src, 1.0
+        small_min = max(1, int(min_size * scale))
+        faces = self.face_cascade.detectMultiScale(
+            small, scaleFactor=scale_factor, minNeighbors=min_neighbors,
+            minSize=(small_min, small_min))
+        inv = 1.0 / scale
+        return [(int(x * inv), int(y * inv), int(w * inv), int(h * inv)) for x, y, w, h in faces]
             
     def recognize_faces(self, frame: np.ndarray) -> Dict[str, Any]:
         """API de reconhecimento (pré-treino ou sem identificar pessoas)."""
@@ -125,8 +262,36 @@ class FaceRecognitionHandler:
 
     # ======= API pública solicitada para modo compatível (sem dlib) =======
     def train_model(self) -> bool:
+        # Fast path: se o dataset não mudou desde o último treino, reutiliza o
+        # modelo persistido em vez de re-treinar (treino é o custo dominante).
+        if self._is_trained() and self._dataset_signature() == self._trained_signature:
+            self.logger.info("Dataset inalterado; reutilizando modelo LBPH existente")
+            return True
         return self._train_lbph_from_dataset()
 
+    def _dataset_signature(self) -> str:
+        """Assinatura do dataset: hash dos (caminho, mtime, tamanho) das imagens.
+
+        Barato (só stat, sem ler pixels) e suficiente para detectar adições,
+        remoções e substituições de arquivos em data/<nome>/.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        try:
+            if os.path.isdir(self.training_data_dir):
+                for name in sorted(os.listdir(self.training_data_dir)):
+                    pdir = os.path.join(self.training_data_dir, name)
+                    if not os.path.isdir(pdir):
+                        continue
+                    for file in sorted(os.listdir(pdir)):
+                        if not file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                            continue
+                        st = os.stat(os.path.join(pdir, file))
+                        h.update(f"{name}/{file}:{st.st_mtime_ns}:{st.st_size}".encode('utf-8'))
+        except Exception as e:
+            self.logger.error(f"Erro ao calcular assinatura do dataset: {e}")
+            return ""
+        return h.hexdigest()
+
     def predict(self, frame: np.ndarray) -> list[dict]:
         """
         Executa detecção e tentativa de identificação.
@@ -137,34 +302,99 @@ class FaceRecognitionHandler:
         if frame is None:
             return results
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5, minSize=(60, 60))
+        # Garante uint8 contíguo na entrada: fatias com stride negativo (ex.:
+        # frame[:, :, ::-1]) ou dtypes diferentes forçariam cópias/conversões
+        # internas no OpenCV a cada operação do pipeline. A verificação é
+        # barata e o caso comum (frame da câmera) não copia nada.
+        if frame.dtype != np.uint8 or not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame, dtype=np.uint8)
 
-        for (x, y, w, h) in faces:
-            roi = gray[y:y + h, x:x + w]
-            name = "Desconhecido"
-            confidence = None
-            distance = None
-            if self._is_trained():
-                try:
-                    pred_label, dist = self.recognizer.predict(roi)
-                    distance = float(dist)
-                    confidence = distance  # mantemos chave 'confidence' como distância bruta (compat)
-                    label_name = self._label_name(pred_label)
-                    # Regra de aceitação: distância <= limiar E label conhecido
-                    if label_name is not None and distance <= self.lbph_threshold:
-                        name = label_name
-                except Exception as e:
-                    self.logger.error(f"Erro na predição LBPH: {e}")
-
-            results.append({
-                "name": name,
-                "confidence": confidence,
-                "bbox": (int(x), int(y), int(w), int(h)),
-                "distance": distance,
-            })
+        # Todo o miolo roda sob o lock: _gray_buf e o estado de rastreio são
+        # compartilhados entre as threads do pool que chamam predict
+        with self._predict_lock:
+            if self._gray_buf is None or self._gray_buf.shape != frame.shape[:2]:
+                self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+            gray = self._gray_buf
+
+            # Detecção é o passo mais caro do pipeline; em fluxos contínuos
+            # (ex.: votação de autorização) as caixas mudam pouco entre frames
+            # consecutivos, então rodamos o detector a cada LBPH_DETECT_EVERY
+            # chamadas e, no meio, avançamos as últimas caixas com fluxo óptico
+            # Lucas-Kanade — o LBPH ainda é avaliado sobre os pixels do frame atual.
+            run_detector = (
+                LBPH_DETECT_EVERY <= 1
+                or not self._last_boxes
+                or (self._predict_calls % LBPH_DETECT_EVERY) == 0
+            )
+            self._predict_calls += 1
+            if run_detector:
+                if self.face_detector_dnn is not None:
+                    faces = self._detect_dnn(frame)
+                else:
+                    faces = self._detect_on_gray(gray, scale_factor=1.2, min_neighbors=5, min_size=60)
+            else:
+                faces = self._track_boxes(gray)
+            self._last_boxes = faces
+            # Cópia necessária: gray aponta para o buffer reutilizado (_gray_buf),
+            # que o próximo frame sobrescreve antes do cálculo do fluxo
+            self._last_gray = gray.copy()
+
+            for (x, y, w, h) in faces:
+                roi = gray[y:y + h, x:x + w]
+                name = "Desconhecido"
+                confidence = None
+                distance = None
+                if self._is_trained():
+                    try:
+                        pred_label, dist = self.recognizer.predict(roi)
+                        distance = float(dist)
+                        confidence = distance  # mantemos chave 'confidence' como distância bruta (compat)
+                        label_name = self._label_name(pred_label)
+                        # Regra de aceitação: distância <= limiar E label conhecido
+                        if label_name is not None and distance <= self.lbph_threshold:
+                            name = label_name
+                    except Exception as e:
+                        self.logger.error(f"Erro na predição LBPH: {e}")
+
+                results.append({
+                    "name": name,
+                    "confidence": confidence,
+                    "bbox": (int(x), int(y), int(w), int(h)),
+                    "distance": distance,
+                })
         return results
 
+    def _track_boxes(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Desloca as caixas da última detecção com fluxo óptico Lucas-Kanade.
+
+        Rastreia apenas o centro de cada caixa entre o frame cinza anterior e
+        o atual (calcOpticalFlowPyrLK esparso): custo desprezível frente ao
+        detectMultiScale, e suficiente para acompanhar o movimento suave de
+        uma face entre frames consecutivos. Caixa cujo rastreio falha é
+        mantida onde estava.
+        """
+        if self._last_gray is None or not self._last_boxes:
+            return self._last_boxes
+        try:
+            pts = np.array([[x + w / 2.0, y + h / 2.0] for x, y, w, h in self._last_boxes],
+                           dtype=np.float32).reshape(-1, 1, 2)
+            nxt, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._last_gray, gray, pts, None, winSize=(21, 21), maxLevel=2)
+            max_y, max_x = gray.shape[:2]
+            boxes: List[Tuple[int, int, int, int]] = []
+            for (x, y, w, h), p0, p1, ok in zip(self._last_boxes, pts, nxt, status):
+                if ok:
+                    dx = float(p1[0][0] - p0[0][0])
+                    dy = float(p1[0][1] - p0[0][1])
+                    x = min(max(0, int(round(x + dx))), max(0, max_x - w))
+                    y = min(max(0, int(round(y + dy))), max(0, max_y - h))
+                boxes.append((x, y, w, h))
+            return boxes
+        except Exception as e:
+            self.logger.error(f"Fluxo óptico falhou: {e}")
+            return self._last_boxes
+
     def _label_name(self, idx: int) -> str | None:
         # Usa mapeamento label_to_name carregado do modelo
         return self.label_to_name.get(idx)
@@ -180,7 +410,14 @@ class FaceRecognitionHandler:
         
     def draw_face_rectangles(self, frame: np.ndarray, result: Dict[str, Any]) -> np.ndarray:
         try:
-            out = frame.copy()
+            # frame.copy() alocava um buffer H*W*3 novo a cada chamada; o
+            # buffer de anotação é mantido no handler e só realocado quando a
+            # resolução muda. O retorno é válido até a próxima chamada — os
+            # usos atuais codificam/salvam o frame antes disso.
+            if self._annot_buf is None or self._annot_buf.shape != frame.shape:
+                self._annot_buf = np.empty_like(frame)
+            np.copyto(self._annot_buf, frame)
+            out = self._annot_buf
             for name, coords in zip(result.get('faces', []), result.get('coordinates', [])):
                 top, right, bottom, left = coords['top'], coords['right'], coords['bottom'], coords['left']
                 color = (0, 255, 0) if name != 'Desconhecido' else (0, 0, 255)
@@ -209,6 +446,10 @@ class FaceRecognitionHandler:
                     os.rmdir(person_dir)
                 except Exception:
                     pass
+            # Sem isto, recadastrar a mesma foto após remover a pessoa seria
+            # pulado pelo dedupe como duplicata
+            if self._image_hashes.pop(name, None) is not None:
+                self._save_image_hashes()
             if self.recognizer is not None:
                 self.train_model()
             return True
@@ -230,7 +471,7 @@ class FaceRecognitionHandler:
                             os.rmdir(root)
                         except Exception:
                             pass
-            for f in (self.lbph_model_file, self.lbph_labels_file):
+            for f in (self.lbph_model_file, self.lbph_labels_file, self.image_hashes_file):
                 try:
                     if os.path.exists(f):
                         os.remove(f)
@@ -238,6 +479,7 @@ class FaceRecognitionHandler:
                     pass
             self.label_to_name.clear()
             self.name_to_label.clear()
+            self._image_hashes.clear()
             if self.recognizer is not None:
                 self.recognizer = cv2.face.LBPHFaceRecognizer_create()
             return True
@@ -245,21 +487,43 @@ class FaceRecognitionHandler:
             self.logger.error(f"Erro ao limpar faces: {e}")
             return False
 
-    def _extract_face_region(self, image: np.ndarray) -> Optional[np.ndarray]:
-        faces = self._detect_faces(image)
-        if not faces:
-            return None
-        x, y, w, h = faces[0]
-        return image[y:y+h, x:x+w]
+    def _update_lbph_incremental(self, face_gray: np.ndarray, name: str) -> bool:
+        """Acrescenta uma imagem ao modelo LBPH treinado via update().
+
+        Para labels existentes, o LBPH suporta treino incremental: só os
+        histogramas da imagem nova são computados, em vez de reprocessar o
+        dataset inteiro a cada cadastro. A assinatura persistida acompanha o
+        dataset para que o fast path do train_model continue coerente.
+        Em caso de falha, cai no re-treino completo.
+        """
+        try:
+            label = self.name_to_label[name]
+            self.recognizer.update([face_gray], np.array([label]))
+            self.recognizer.write(self.lbph_model_file)
+            self._trained_signature = self._dataset_signature()
+            self._save_labels(self.label_to_name, self.name_to_label, self._trained_signature)
+            return True
+        except Exception as e:
+            self.logger.error(f"Update incremental LBPH falhou, re-treinando: {e}")
+            return self._train_lbph_from_dataset()
+
+    def _save_labels(self, label_to_name: Dict[int, str], name_to_label: Dict[str, int],
+                     signature: str) -> None:
+        with open(self.lbph_labels_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "label_to_name": label_to_name,
+                "name_to_label": name_to_label,
+                "dataset_signature": signature,
+            }, f, ensure_ascii=False)
 
     def _train_lbph_from_dataset(self) -> bool:
         if self.recognizer is None:
             return False
-        images: List[np.ndarray] = []
-        labels: List[int] = []
         label_to_name: Dict[int, str] = {}
         name_to_label: Dict[str, int] = {}
         os.makedirs(self.training_data_dir, exist_ok=True)
+        # Coleta todos os (caminho, label) primeiro para decodificar em lote
+        pairs: List[Tuple[str, int]] = []
         current = 0
         for name in sorted(os.listdir(self.training_data_dir)):
             pdir = os.path.join(self.training_data_dir, name)
@@ -269,23 +533,33 @@ class FaceRecognitionHandler:
             label_to_name[current] = name
             for file in os.listdir(pdir):
                 if file.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    path = os.path.join(pdir, file)
-                    img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+                    pairs.append((os.path.join(pdir, file), current))
+            current += 1
+
+        # cv2.imread libera a GIL durante a decodificação JPEG/PNG, então um
+        # pool de threads escala a leitura do dataset com o número de núcleos.
+        images: List[np.ndarray] = []
+        labels: List[int] = []
+        if pairs:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+                loaded = ex.map(lambda p: cv2.imread(p, cv2.IMREAD_GRAYSCALE),
+                                [path for path, _ in pairs])
+                for (path, label), img in zip(pairs, loaded):
                     if img is None or img.size == 0:
                         continue
                     images.append(img)
-                    labels.append(current)
-            current += 1
+                    labels.append(label)
         if not images:
             self.logger.warning("Sem imagens para treino LBPH")
             return False
         try:
             self.recognizer.train(images, np.array(labels))
             self.recognizer.write(self.lbph_model_file)
-            with open(self.lbph_labels_file, 'w', encoding='utf-8') as f:
-                json.dump({"label_to_name": label_to_name, "name_to_label": name_to_label}, f, ensure_ascii=False)
+            signature = self._dataset_signature()
+            self._save_labels(label_to_name, name_to_label, signature)
             self.label_to_name = label_to_name
             self.name_to_label = name_to_label
+            self._trained_signature = signature
             return True
         except Exception as e:
             self.logger.error(f"Treino LBPH falhou: {e}")
@@ -301,6 +575,7 @@ class FaceRecognitionHandler:
                     data = json.load(f)
                 self.label_to_name = {int(k): v for k, v in data.get('label_to_name', {}).items()}
                 self.name_to_label = {k: int(v) for k, v in data.get('name_to_label', {}).items()}
+                self._trained_signature = data.get('dataset_signature', "")
                 self.logger.info("Modelo LBPH carregado")
         except Exception as e:
             self.logger.error(f"Falha ao carregar modelo LBPH: {e}")
@@ -9,8 +9,10 @@ Visão geral (o que este arquivo faz):
 
 Como o protocolo funciona:
 - O cliente envia objetos JSON 1-por-linha. Ex.: {"type": "predict"}\n
-- O servidor lê do socket, acumula no buffer até encontrar "\n", faz json.loads e roteia.
-- A resposta é sempre um JSON único terminado por "\n" também.
+- O servidor lê do socket, acumula no buffer até encontrar "\n", faz o parse e roteia.
+- A resposta é sempre um JSON único terminado por "\n"; respostas com imagem
+  anunciam "image_len" na linha e os bytes crus do JPEG seguem logo após o "\n"
+  (sem base64 no fio).
 
 Handlers usados:
 - CameraHandler: encapsula acesso à webcam (OpenCV) e codificação de frames.
@@ -25,14 +27,16 @@ import cv2
 import socket
 import threading
 import logging
-import json
-import base64
+import logging.handlers
+import functools
+import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Optional
 import time
 import argparse
 import os
 
+import protocol
 from camera_handler import CameraHandler
 from face_recognition_handler_compatible import FaceRecognitionHandler
 from config import (
@@ -50,6 +54,58 @@ from config import (
     LBPH_MIN_VOTES_STRICT,
 )
 
+try:
+    # Mesmo racional do cliente: pybase64 usa SIMD no encode e é ~5-10x mais
+    # rápido que a stdlib. Aqui só resta um uso (coleta de dataset, que passa
+    # pelo pipeline base64 do add_known_face), mas mantemos o par simétrico.
+    import pybase64 as b64
+except ImportError:
+    import binascii
+
+    class _BinasciiB64:
+        """Adapta binascii à API b64encode usada no servidor."""
+
+        @staticmethod
+        def b64encode(data):
+            return binascii.b2a_base64(data, newline=False)
+
+    b64 = _BinasciiB64
+
+
+# Mensagens de formato fixo são pré-serializadas uma única vez; só o timestamp
+# varia, então basta concatenar o sufixo por conexão em vez de montar o dict e
+# rodar json.dumps a cada cliente.
+_WELCOME_PREFIX = b'{"type": "welcome", "message": "Conectado ao servidor de reconhecimento facial", "timestamp": '
+_PONG_PREFIX = b'{"type": "pong", "timestamp": '
+_INVALID_MSG_PREFIX = b'{"type": "error", "message": "Formato de mensagem inv\\u00e1lido", "timestamp": '
+
+
+class BufferPool:
+    """Pool de bytearrays de recepção compartilhado entre as conexões.
+
+    Ordem LIFO de propósito: o último buffer devolvido é o próximo entregue,
+    então o buffer mais provável de ainda estar quente em L1/L2 é o que volta
+    ao trabalho. Com o pool, a pressão de heap não cresce com o churn de
+    conexões — cada bytearray vive pela vida do servidor, não da conexão.
+    """
+
+    def __init__(self, count: int, size: int):
+        self._size = size
+        self._q: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(count):
+            self._q.put(bytearray(size))
+
+    def acquire(self) -> bytearray:
+        """Retira um buffer do pool (ou aloca um novo se estiver vazio)."""
+        try:
+            return self._q.get_nowait()
+        except queue.Empty:
+            return bytearray(self._size)
+
+    def release(self, buf: bytearray) -> None:
+        """Devolve o buffer ao pool para a próxima conexão."""
+        self._q.put(buf)
+
 
 class FacialRecognitionServer:
     """Servidor principal para reconhecimento facial com suporte a múltiplos clientes."""
@@ -69,7 +125,13 @@ class FacialRecognitionServer:
         self.max_workers = max_workers
         self.server_socket: Optional[socket.socket] = None
         self.executor: Optional[ThreadPoolExecutor] = None
+        # Conjunto completo de CPUs do processo, capturado antes de qualquer
+        # pinagem de acceptor (ver _init_worker)
+        self._all_cpus: Optional[set] = None
         self.is_running = False
+        # Sinalizado após bind()+listen(); scripts/testes podem aguardar com
+        # server.ready.wait() em vez de time.sleep() arbitrário.
+        self.ready = threading.Event()
         
         # Handlers especializados
         if resolution is None:
@@ -78,9 +140,15 @@ class FacialRecognitionServer:
         # Handler facial (LBPH apenas)
         self.face_handler = FaceRecognitionHandler()
         
-        # Controle de conexões ativas
-        self.active_connections: Dict[str, socket.socket] = {}
-        self.connection_lock = threading.Lock()
+        # Controle de conexões ativas, particionado em shards: registrar,
+        # remover e inspecionar uma conexão só disputa o lock do shard dela
+        # (hash do client_id), em vez de serializar todas as threads em um
+        # único lock global a cada connect/disconnect.
+        self._conn_shards: list[Dict[str, socket.socket]] = [{} for _ in range(max_workers)]
+        self._conn_locks: list[threading.Lock] = [threading.Lock() for _ in range(max_workers)]
+
+        # Buffers de recepção reutilizados entre conexões (ver BufferPool)
+        self._recv_pool = BufferPool(max_workers, 64 * 1024)
         
         # Configuração de logging
         self._setup_logging()
@@ -93,33 +161,79 @@ class FacialRecognitionServer:
         except Exception:
             pass
 
+        # Os handlers reais (arquivo + console) ficam atrás de um QueueListener
+        # em thread própria: um logger.info no handle_client vira só um put na
+        # fila, sem bloquear a thread do cliente em I/O de disco.
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(os.path.join(LOG_DIR, 'server.log'))
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(os.path.join(LOG_DIR, 'server.log')),
-                logging.StreamHandler()
-            ]
+            handlers=[logging.handlers.QueueHandler(log_queue)]
         )
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler)
+        self._log_listener.start()
         self.logger = logging.getLogger(__name__)
         
+    def _create_listener(self) -> socket.socket:
+        """Cria, configura e coloca em escuta um socket TCP no host/porta."""
+        # AF_INET: IPv4 | SOCK_STREAM: TCP
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # SO_REUSEPORT (Linux/BSD): além de evitar falhas de bind por
+        # TIME_WAIT em reinícios rápidos, permite vários sockets de escuta na
+        # mesma porta — o kernel balanceia as conexões entre eles.
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                self._reuseport = True
+            except OSError:
+                self._reuseport = False
+        sock.bind((self.host, self.port))
+        sock.listen(5)
+        return sock
+
     def start_server(self) -> None:
         """Inicia o servidor e aceita conexões."""
         try:
-            # Configuração do socket
-            # AF_INET: IPv4 | SOCK_STREAM: TCP
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
-            
-            # Inicialização do ThreadPool
-            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
-            
+            self._reuseport = False
+            self.server_socket = self._create_listener()
+
+            # Com SO_REUSEPORT, sockets de escuta adicionais (um por thread
+            # aceitadora) eliminam a contenção na fila de accept: o kernel
+            # distribui as conexões novas entre as filas sem lock no userspace.
+            self._listeners = [self.server_socket]
+            if self._reuseport and self.max_workers > 1:
+                for _ in range(min(self.max_workers, os.cpu_count() or 1) - 1):
+                    try:
+                        self._listeners.append(self._create_listener())
+                    except OSError:
+                        break
+
+            # Inicialização do ThreadPool. As threads do pool nascem de forma
+            # preguiçosa dentro de executor.submit(), ou seja, na thread
+            # aceitadora — que pode estar fixada em um único núcleo (ver
+            # _accept_loop) e cuja máscara de afinidade seria herdada. O
+            # initializer devolve cada worker ao conjunto completo de CPUs
+            # capturado antes de qualquer pinagem, para que o trabalho
+            # CPU-bound (LBPH) não fique confinado aos núcleos dos acceptors.
+            self._all_cpus = (os.sched_getaffinity(0)
+                              if hasattr(os, "sched_getaffinity") else None)
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               initializer=self._init_worker)
+
             self.is_running = True
+            self.ready.set()
             self.logger.info(f"Servidor iniciado em {self.host}:{self.port}")
+            if len(self._listeners) > 1:
+                self.logger.info(f"{len(self._listeners)} sockets de escuta (SO_REUSEPORT)")
             self.logger.info(f"ThreadPool configurado com {self.max_workers} workers")
-            
+
             # Inicializa handlers
             # Câmera: tenta abrir a webcam e setar resolução/buffer
             ok = self.camera_handler.initialize_camera()
@@ -130,27 +244,78 @@ class FacialRecognitionServer:
                 self.logger.error("3) Teste a webcam no aplicativo Câmera do Windows")
             # Faces: carrega base/modelos persistidos (se houver)
             self.face_handler.load_known_faces()
-            
-            # Loop principal de aceitação de conexões
-            while self.is_running:
-                try:
-                    client_socket, client_address = self.server_socket.accept()
-                    self.logger.info(f"Nova conexão de {client_address}")
-                    
-                    # Submete a conexão para o ThreadPool
-                    future = self.executor.submit(self.handle_client, client_socket, client_address)
-                    
-                    # Adiciona callback para limpeza quando a conexão terminar
-                    future.add_done_callback(lambda f: self._cleanup_connection(client_address))
-                    
-                except socket.error as e:
-                    if self.is_running:
-                        self.logger.error(f"Erro ao aceitar conexão: {e}")
-                        
+
+            # Threads aceitadoras extras (uma por listener adicional); o
+            # listener principal roda nesta thread, preservando o comportamento
+            # de bloqueio do start_server.
+            ncpu = os.cpu_count() or 1
+            pin = len(self._listeners) > 1 and hasattr(os, "sched_setaffinity")
+            for i, listener in enumerate(self._listeners[1:], start=1):
+                t = threading.Thread(target=self._accept_loop,
+                                     args=(listener, i % ncpu if pin else None),
+                                     daemon=True)
+                t.start()
+            self._accept_loop(self.server_socket, 0 if pin else None)
+
         except Exception as e:
             self.logger.error(f"Erro ao iniciar servidor: {e}")
         finally:
             self.shutdown()
+
+    def _init_worker(self) -> None:
+        """Initializer das threads do pool: restaura a afinidade completa.
+
+        Threads novas herdam a máscara de afinidade de quem as criou; como os
+        workers são criados dentro de submit() por acceptors possivelmente
+        pinados, sem este reset todo o pool ficaria preso aos núcleos deles.
+        """
+        if self._all_cpus:
+            try:
+                os.sched_setaffinity(0, self._all_cpus)
+            except OSError:
+                pass
+
+    def _accept_loop(self, listener: socket.socket, cpu: Optional[int] = None) -> None:
+        """Aceita conexões de um socket de escuta e as envia ao ThreadPool."""
+        if cpu is not None:
+            # Afinidade de CPU (Linux): com SO_REUSEPORT o kernel direciona
+            # cada conexão à fila do listener escolhido por hash RSS; fixar a
+            # thread aceitadora em um núcleo mantém o estado do socket na L1/L2
+            # do mesmo core em que os pacotes chegam, evitando cache-line
+            # bouncing entre CPUs. Os workers do pool não herdam esta máscara:
+            # o initializer do executor a restaura (ver _init_worker).
+            try:
+                os.sched_setaffinity(0, {cpu})
+            except OSError:
+                pass
+        while self.is_running:
+            try:
+                client_socket, client_address = listener.accept()
+                # TCP_NODELAY: o protocolo é request-reply com mensagens que
+                # cabem em um MSS; o Nagle adiaria respostas pequenas em até
+                # 40 ms. Buffers de 1 MiB dão folga para as respostas com
+                # imagem sem estrangular vazão em links de RTT maior.
+                try:
+                    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+                except OSError:
+                    pass
+                # Lazy %s e nível DEBUG: em taxa alta de conexões, nada é formatado
+                # a menos que o log por conexão esteja habilitado
+                self.logger.debug("Nova conexão de %s", client_address)
+
+                # Submete a conexão para o ThreadPool
+                future = self.executor.submit(self.handle_client, client_socket, client_address)
+
+                # Callback de limpeza via partial sobre o método bound: uma
+                # alocação a menos por conexão que o lambda (sem closure cell)
+                # e sem o frame Python extra do corpo do lambda na conclusão
+                future.add_done_callback(functools.partial(self._on_client_done, client_address))
+
+            except socket.error as e:
+                if self.is_running:
+                    self.logger.error(f"Erro ao aceitar conexão: {e}")
             
     def handle_client(self, client_socket: socket.socket, client_address: tuple) -> None:
         """
@@ -161,53 +326,69 @@ class FacialRecognitionServer:
             client_address: Endereço do cliente
         """
         client_id = f"{client_address[0]}:{client_address[1]}"
-        
+        chunk = self._recv_pool.acquire()
+
         try:
-            # Registra a conexão
-            with self.connection_lock:
-                self.active_connections[client_id] = client_socket
+            # Registra a conexão no shard correspondente
+            shard, lock = self._conn_shard(client_id)
+            with lock:
+                shard[client_id] = client_socket
                 
-            self.logger.info(f"Iniciando atendimento ao cliente {client_id}")
+            self.logger.debug("Iniciando atendimento ao cliente %s", client_id)
             
-            # Envia mensagem de boas-vindas
-            welcome_msg = {
-                "type": "welcome",
-                "message": "Conectado ao servidor de reconhecimento facial",
-                "timestamp": time.time()
-            }
-            self._send_message(client_socket, welcome_msg)
+            # Envia mensagem de boas-vindas (prefixo pré-serializado)
+            self._send_raw(client_socket, _WELCOME_PREFIX + f"{time.time():.6f}".encode('ascii') + b'}\n')
             
-            # Loop de comunicação com o cliente (bufferizado por linhas)
-            recv_buffer = b""
+            # Loop de comunicação com o cliente (bufferizado por linhas).
+            # recv_into escreve em um bytearray fixo reutilizado pela conexão
+            # inteira, em vez de alocar um bytes novo a cada recv(4096) — a
+            # pressão de GC por leitura some do caminho quente.
+            recv_buffer = bytearray()
+            chunk_view = memoryview(chunk)
             while self.is_running:
                 try:
-                    # Recebe dados do cliente
-                    data = client_socket.recv(4096)
-                    if not data:
+                    n = client_socket.recv_into(chunk_view)
+                    if n == 0:
                         break
 
-                    recv_buffer += data
+                    recv_buffer += chunk_view[:n]
 
                     # Processa todas as mensagens completas (terminadas com \n)
-                    # Importante: o TCP é um stream; uma leitura pode conter múltiplas mensagens ou mensagens parciais.
-                    # Por isso, acumulamos no buffer e dividimos por "\n".
-                    while b"\n" in recv_buffer:
-                        line, recv_buffer = recv_buffer.split(b"\n", 1)
+                    # Importante: o TCP é um stream; uma leitura pode conter
+                    # múltiplas mensagens ou mensagens parciais. Um find por
+                    # linha avança o cursor e o buffer é compactado uma vez ao
+                    # final, sem o O(N²) do split por mensagem.
+                    scan_pos = 0
+                    while True:
+                        nl = recv_buffer.find(b"\n", scan_pos)
+                        if nl < 0:
+                            break
+                        line = bytes(recv_buffer[scan_pos:nl])
+                        scan_pos = nl + 1
                         if not line.strip():
                             continue
                         try:
-                            message = json.loads(line.decode('utf-8'))
-                        except json.JSONDecodeError:
-                            error_response = {
-                                "type": "error",
-                                "message": "Formato de mensagem inválido",
-                                "timestamp": time.time()
-                            }
-                            self._send_message(client_socket, error_response)
+                            # protocol.loads aceita bytes direto (orjson quando
+                            # disponível), sem o decode UTF-8 intermediário
+                            message = protocol.loads(line)
+                        except protocol.JSONDecodeError:
+                            self._send_raw(client_socket, _INVALID_MSG_PREFIX
+                                           + f"{time.time():.6f}".encode('ascii') + b'}\n')
                             continue
 
-                        response = self._process_client_message(message)
-                        self._send_message(client_socket, response)
+                        # Um único time.time() por turno de mensagem; os
+                        # handlers carimbam a resposta com este valor em vez
+                        # de chamar o relógio 2-3 vezes cada
+                        now = time.time()
+                        response = self._process_client_message(message, now)
+                        # Respostas de formato fixo (ex.: pong) já chegam
+                        # serializadas como bytes prontos para o socket
+                        if isinstance(response, bytes):
+                            self._send_raw(client_socket, response)
+                        else:
+                            self._send_message(client_socket, response)
+                    if scan_pos:
+                        del recv_buffer[:scan_pos]
 
                 except socket.timeout:
                     continue
@@ -215,42 +396,48 @@ class FacialRecognitionServer:
         except Exception as e:
             self.logger.error(f"Erro ao atender cliente {client_id}: {e}")
         finally:
+            self._recv_pool.release(chunk)
             self._disconnect_client(client_socket, client_id)
             
-    def _process_client_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_client_message(self, message: Dict[str, Any],
+                                now: Optional[float] = None) -> Dict[str, Any]:
         """
         Processa mensagens recebidas do cliente.
         
         Args:
             message: Mensagem do cliente
-            
+            now: Timestamp único do turno (default: time.time())
+
         Returns:
-            Resposta para o cliente
+            Resposta para o cliente: dict a serializar ou bytes já prontos
+            (respostas de formato fixo, pré-serializadas)
         """
+        if now is None:
+            now = time.time()
         message_type = message.get("type", "unknown")  # roteamento por tipo
         
         if message_type == "recognize_face":
-            return self._handle_face_recognition()
+            return self._handle_face_recognition(now)
             
         # 'capture_image' removido conforme nova UX
             
         elif message_type == "add_known_face":
-            return self._handle_add_known_face(message)
+            return self._handle_add_known_face(message, now)
             
         elif message_type == "list_known_faces":
-            return self._handle_list_known_faces()
+            return self._handle_list_known_faces(now)
 
         elif message_type == "train_model":
-            return self._handle_train_model()
+            return self._handle_train_model(now)
 
         elif message_type == "clear_model":
-            return self._handle_clear_model()
+            return self._handle_clear_model(now)
 
         elif message_type == "predict":
-            return self._handle_predict()
+            return self._handle_predict(now)
             
         elif message_type == "collect_dataset":
-            return self._handle_collect_dataset(message)
+            return self._handle_collect_dataset(message, now)
 
         elif message_type == "authorize_access":
             count = int(message.get("count", 3))
@@ -303,28 +490,39 @@ class FacialRecognitionServer:
             # Snapshot opcional (último frame válido)
             if frame is not None:
                 try:
-                    ok, jpg = cv2.imencode(".jpg", frame)
+                    ok, jpg = self.camera_handler.encode_frame(frame)
                     if ok:
-                        response["image_data"] = base64.b64encode(jpg.tobytes()).decode("ascii")
+                        response["image_blob"] = jpg.tobytes()
                 except Exception:
                     pass
 
             return response
 
         elif message_type == "ping":
-            return {
-                "type": "pong",
-                "timestamp": time.time()
-            }
+            # Resposta de esquema fixo: montada por concatenação sobre o
+            # prefixo pré-serializado (como o welcome), sem construir dict nem
+            # rodar o serializador JSON no caminho mais frequente do protocolo.
+            # O eco do relógio monotônico do cliente permite medir RTT sem
+            # depender de relógios de parede sincronizados entre as máquinas.
+            echo = b''
+            try:
+                if "client_ts_ns" in message:
+                    echo = b', "client_ts_ns": ' + str(int(message["client_ts_ns"])).encode('ascii')
+                elif "client_ts" in message:
+                    # Compatibilidade com clientes antigos (float em segundos)
+                    echo = b', "client_ts": ' + f"{float(message['client_ts']):.9f}".encode('ascii')
+            except (TypeError, ValueError):
+                echo = b''
+            return _PONG_PREFIX + f"{now:.6f}".encode('ascii') + echo + b'}\n'
             
         else:
             return {
                 "type": "error",
                 "message": f"Tipo de mensagem não reconhecido: {message_type}",
-                "timestamp": time.time()
+                "timestamp": now
             }
             
-    def _handle_face_recognition(self) -> Dict[str, Any]:
+    def _handle_face_recognition(self, now: float) -> Dict[str, Any]:
         """Executa reconhecimento facial."""
         try:
             # Captura frame da câmera
@@ -333,23 +531,23 @@ class FacialRecognitionServer:
                 return {
                     "type": "error",
                     "message": "Falha ao capturar imagem da câmera",
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
                 
             # Executa reconhecimento
             # Nota: com LBPH treinado → prediz identidade; sem LBPH → somente detecção
             result = self.face_handler.recognize_faces(frame)
             
-            # Codifica imagem para envio (opcional)
+            # Codifica imagem para envio (opcional); os bytes crus seguem o
+            # JSON no fio (ver _send_message), sem base64
             _, buffer = self.camera_handler.encode_frame(frame)
-            image_data = base64.b64encode(buffer).decode('utf-8')
-            
+
             return {
                 "type": "recognition_result",
                 "recognized_faces": result["faces"],
                 "confidence_scores": result["confidence"],
-                "image_data": image_data,
-                "timestamp": time.time()
+                "image_blob": buffer.tobytes(),
+                "timestamp": now
             }
             
         except Exception as e:
@@ -357,18 +555,18 @@ class FacialRecognitionServer:
             return {
                 "type": "error",
                 "message": f"Erro no reconhecimento: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
             
     # _handle_image_capture removido conforme nova UX
             
-    def _handle_collect_dataset(self, message: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_collect_dataset(self, message: Dict[str, Any], now: float) -> Dict[str, Any]:
         """Coleta N imagens via câmera para o dataset data/<name>/ usando o fluxo de add_known_face."""
         try:
             name = message.get("name")
             count = int(message.get("count", 20))
             if not name or count <= 0:
-                return {"type": "error", "message": "Parâmetros inválidos para coleta de dataset", "timestamp": time.time()}
+                return {"type": "error", "message": "Parâmetros inválidos para coleta de dataset", "timestamp": now}
 
             saved = 0
             attempts = 0
@@ -385,8 +583,8 @@ class FacialRecognitionServer:
                 ok, buf = self.camera_handler.encode_frame(frame)
                 if not ok:
                     continue
-                b64 = base64.b64encode(buf).decode('utf-8')
-                if self.face_handler.add_known_face(name, b64):
+                face_b64 = b64.b64encode(buf).decode('utf-8')
+                if self.face_handler.add_known_face(name, face_b64):
                     saved += 1
                     time.sleep(0.2)
 
@@ -396,13 +594,13 @@ class FacialRecognitionServer:
                 "requested": count,
                 "saved": saved,
                 "name": name,
-                "timestamp": time.time()
+                "timestamp": time.time()  # coleta demora; carimbo fresco
             }
         except Exception as e:
             self.logger.error(f"Erro na coleta de dataset: {e}")
-            return {"type": "error", "message": f"Erro na coleta: {str(e)}", "timestamp": time.time()}
+            return {"type": "error", "message": f"Erro na coleta: {str(e)}", "timestamp": now}
 
-    def _handle_add_known_face(self, message: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_add_known_face(self, message: Dict[str, Any], now: float) -> Dict[str, Any]:
         """Adiciona nova face conhecida."""
         try:
             name = message.get("name")
@@ -412,7 +610,7 @@ class FacialRecognitionServer:
                 return {
                     "type": "error",
                     "message": "Nome e dados da imagem são obrigatórios",
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
                 
             success = self.face_handler.add_known_face(name, image_data)
@@ -421,23 +619,23 @@ class FacialRecognitionServer:
                 return {
                     "type": "face_added",
                     "message": f"Face de {name} adicionada com sucesso",
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
             else:
                 return {
                     "type": "error",
                     "message": "Falha ao adicionar face",
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
                 
         except Exception as e:
             return {
                 "type": "error",
                 "message": f"Erro ao adicionar face: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
             
-    def _handle_list_known_faces(self) -> Dict[str, Any]:
+    def _handle_list_known_faces(self, now: float) -> Dict[str, Any]:
         """Lista faces conhecidas."""
         try:
             known_faces = self.face_handler.get_known_faces_list()
@@ -445,16 +643,16 @@ class FacialRecognitionServer:
                 "type": "known_faces_list",
                 "faces": known_faces,
                 "count": len(known_faces),
-                "timestamp": time.time()
+                "timestamp": now
             }
         except Exception as e:
             return {
                 "type": "error",
                 "message": f"Erro ao listar faces: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
 
-    def _handle_train_model(self) -> Dict[str, Any]:
+    def _handle_train_model(self, now: float) -> Dict[str, Any]:
         """Treina o modelo (LBPH no modo compatível)."""
         try:
             success = False
@@ -468,34 +666,34 @@ class FacialRecognitionServer:
                 "known_faces": self.face_handler.get_known_faces_list(),
                 "dataset_counts": dataset_counts,
                 "total_images": total_images,
-                "timestamp": time.time()
+                "timestamp": now
             }
         except Exception as e:
             self.logger.error(f"Erro ao treinar modelo: {e}")
             return {
                 "type": "error",
                 "message": f"Erro ao treinar modelo: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
 
-    def _handle_clear_model(self) -> Dict[str, Any]:
+    def _handle_clear_model(self, now: float) -> Dict[str, Any]:
         """Limpa dataset/modelo e zera faces conhecidas."""
         try:
             success = self.face_handler.clear_all_faces()
             return {
                 "type": "model_cleared",
                 "success": bool(success),
-                "timestamp": time.time()
+                "timestamp": now
             }
         except Exception as e:
             self.logger.error(f"Erro ao limpar modelo: {e}")
             return {
                 "type": "error",
                 "message": f"Erro ao limpar modelo: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
 
-    def _handle_predict(self) -> Dict[str, Any]:
+    def _handle_predict(self, now: float) -> Dict[str, Any]:
         """Executa predição (equivalente a reconhecer usando handler.predict)."""
         try:
             frame = self.camera_handler.capture_frame()
@@ -503,7 +701,7 @@ class FacialRecognitionServer:
                 return {
                     "type": "error",
                     "message": "Falha ao capturar imagem da câmera",
-                    "timestamp": time.time()
+                    "timestamp": now
                 }
 
             if hasattr(self.face_handler, 'predict'):
@@ -513,7 +711,7 @@ class FacialRecognitionServer:
                 result = self.face_handler.recognize_faces(frame)
 
             _, buffer = self.camera_handler.encode_frame(frame)
-            image_data = base64.b64encode(buffer).decode('utf-8')
+            image_blob = buffer.tobytes()
             if isinstance(result, list):
                 recognized_faces = [p.get("name", "Desconhecido") for p in result]
                 confidence_scores = [p.get("confidence") for p in result]
@@ -522,8 +720,8 @@ class FacialRecognitionServer:
                     "recognized_faces": recognized_faces,
                     "confidence_scores": confidence_scores,
                     "raw": result,
-                    "image_data": image_data,
-                    "timestamp": time.time()
+                    "image_blob": image_blob,
+                    "timestamp": now
                 }
             # Compat se ainda for dict (estrutura antiga)
             return {
@@ -531,15 +729,15 @@ class FacialRecognitionServer:
                 "recognized_faces": result.get("faces", []),
                 "confidence_scores": result.get("confidence", []),
                 "raw": result,
-                "image_data": image_data,
-                "timestamp": time.time()
+                "image_blob": image_blob,
+                "timestamp": now
             }
         except Exception as e:
             self.logger.error(f"Erro na predição: {e}")
             return {
                 "type": "error",
                 "message": f"Erro na predição: {str(e)}",
-                "timestamp": time.time()
+                "timestamp": now
             }
 
     def _handle_authorize_access(self, message: Dict[str, Any]) -> Dict[str, Any]:
@@ -625,9 +823,9 @@ class FacialRecognitionServer:
 
             if last_frame is not None:
                 try:
-                    ok, jpg = cv2.imencode(".jpg", last_frame)
+                    ok, jpg = self.camera_handler.encode_frame(last_frame)
                     if ok:
-                        response["image_data"] = base64.b64encode(jpg.tobytes()).decode("ascii")
+                        response["image_blob"] = jpg.tobytes()
                 except Exception:
                     pass
 
@@ -641,38 +839,92 @@ class FacialRecognitionServer:
             }
             
     def _send_message(self, client_socket: socket.socket, message: Dict[str, Any]) -> None:
-        """Envia mensagem para o cliente."""
+        """Envia mensagem para o cliente.
+
+        Mensagens com a chave interna "image_blob" (bytes de JPEG) saem como
+        frame binário: a linha JSON anuncia o tamanho em "image_len" e os
+        bytes crus seguem logo após o '\\n'. Isso elimina o base64 do caminho
+        de imagens (~33% a menos no fio e uma passada a menos sobre os bytes).
+        """
+        blob = message.pop("image_blob", None)
+        if blob:
+            message["image_len"] = len(blob)
+            self._send_parts(client_socket, protocol.dumps(message) + b"\n", blob)
+        else:
+            self._send_raw(client_socket, protocol.dumps(message) + b"\n")
+
+    def _send_parts(self, client_socket: socket.socket, *parts: bytes) -> None:
+        """Envia um frame fornecido em múltiplos buffers (linha + blob).
+
+        sendmsg (scatter-gather/writev) deixa o kernel juntar os pedaços na
+        escrita: nem a concatenação O(n) da linha com o JPEG no userland, nem
+        um segundo syscall. Short writes são completados reenviando só o
+        restante; sem sendmsg (ex.: Windows), cai no sendall concatenado.
+        """
+        try:
+            if hasattr(client_socket, "sendmsg"):
+                total = sum(len(p) for p in parts)
+                sent = client_socket.sendmsg(parts)
+                while sent < total:
+                    skip = sent
+                    iov = []
+                    for p in parts:
+                        if skip >= len(p):
+                            skip -= len(p)
+                            continue
+                        iov.append(memoryview(p)[skip:] if skip else p)
+                        skip = 0
+                    sent += client_socket.sendmsg(iov)
+            else:
+                client_socket.sendall(b"".join(parts))
+        except Exception as e:
+            self.logger.error(f"Erro ao enviar mensagem: {e}")
+
+    def _send_raw(self, client_socket: socket.socket, data: bytes) -> None:
+        """Envia bytes já serializados (deve incluir o '\\n' delimitador)."""
         try:
-            data = json.dumps(message).encode('utf-8') + b"\n"
             client_socket.sendall(data)
         except Exception as e:
             self.logger.error(f"Erro ao enviar mensagem: {e}")
             
+    def _conn_shard(self, client_id: str) -> tuple:
+        """Shard (dict, lock) responsável por um client_id."""
+        i = hash(client_id) % len(self._conn_shards)
+        return self._conn_shards[i], self._conn_locks[i]
+
     def _disconnect_client(self, client_socket: socket.socket, client_id: str) -> None:
         """Desconecta um cliente e limpa recursos."""
         try:
             client_socket.close()
-            with self.connection_lock:
-                if client_id in self.active_connections:
-                    del self.active_connections[client_id]
-            self.logger.info(f"Cliente {client_id} desconectado")
+            shard, lock = self._conn_shard(client_id)
+            with lock:
+                shard.pop(client_id, None)
+            self.logger.debug("Cliente %s desconectado", client_id)
         except Exception as e:
             self.logger.error(f"Erro ao desconectar cliente {client_id}: {e}")
             
+    def _on_client_done(self, client_address: tuple, future) -> None:
+        """Callback de conclusão do future da conexão (ver _accept_loop)."""
+        self._cleanup_connection(client_address)
+
     def _cleanup_connection(self, client_address: tuple) -> None:
         """Callback para limpeza quando uma conexão termina."""
         client_id = f"{client_address[0]}:{client_address[1]}"
-        self.logger.info(f"Limpeza da conexão {client_id} completada")
+        self.logger.debug("Limpeza da conexão %s completada", client_id)
         
     def get_server_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do servidor."""
-        with self.connection_lock:
-            return {
-                "active_connections": len(self.active_connections),
-                "max_workers": self.max_workers,
-                "is_running": self.is_running,
-                "connected_clients": list(self.active_connections.keys())
-            }
+        # Snapshot shard a shard, cada um sob o próprio lock
+        connected = []
+        for shard, lock in zip(self._conn_shards, self._conn_locks):
+            with lock:
+                connected.extend(shard.keys())
+        return {
+            "active_connections": len(connected),
+            "max_workers": self.max_workers,
+            "is_running": self.is_running,
+            "connected_clients": connected
+        }
 
     def _dataset_counts(self) -> tuple[Dict[str, int], int]:
         """Conta imagens por pessoa no diretório de dataset."""
@@ -680,18 +932,20 @@ class FacialRecognitionServer:
         total = 0
         try:
             if os.path.isdir(DATA_DIR):
-                for name in os.listdir(DATA_DIR):
-                    person_dir = os.path.join(DATA_DIR, name)
-                    if not os.path.isdir(person_dir):
-                        continue
-                    c = 0
-                    for f in os.listdir(person_dir):
-                        lf = f.lower()
-                        if lf.endswith('.jpg') or lf.endswith('.jpeg') or lf.endswith('.png'):
-                            c += 1
-                    if c > 0:
-                        counts[name] = c
-                        total += c
+                # os.scandir devolve o tipo do entry junto com o nome (aproveita o
+                # d_type do readdir), evitando um stat() extra por diretório/arquivo.
+                with os.scandir(DATA_DIR) as it:
+                    for entry in it:
+                        if not entry.is_dir():
+                            continue
+                        c = 0
+                        with os.scandir(entry.path) as files:
+                            for f in files:
+                                if f.name.lower().endswith(('.jpg', '.jpeg', '.png')):
+                                    c += 1
+                        if c > 0:
+                            counts[entry.name] = c
+                            total += c
         except Exception as e:
             self.logger.error(f"Erro ao contar dataset: {e}")
         return counts, total
@@ -700,32 +954,45 @@ class FacialRecognitionServer:
         """Encerra o servidor de forma segura."""
         self.logger.info("Iniciando shutdown do servidor...")
         self.is_running = False
+        self.ready.clear()
         
-        # Fecha todas as conexões ativas
-        with self.connection_lock:
-            for client_id, client_socket in self.active_connections.items():
-                try:
-                    client_socket.close()
-                    self.logger.info(f"Conexão {client_id} fechada")
-                except Exception as e:
-                    self.logger.error(f"Erro ao fechar conexão {client_id}: {e}")
-            self.active_connections.clear()
+        # Fecha todas as conexões ativas, shard a shard
+        for shard, lock in zip(self._conn_shards, self._conn_locks):
+            with lock:
+                for client_id, client_socket in shard.items():
+                    try:
+                        client_socket.close()
+                        self.logger.info(f"Conexão {client_id} fechada")
+                    except Exception as e:
+                        self.logger.error(f"Erro ao fechar conexão {client_id}: {e}")
+                shard.clear()
         
         # Encerra o ThreadPool
         if self.executor:
             self.executor.shutdown(wait=True)
             self.logger.info("ThreadPool encerrado")
             
-        # Fecha socket do servidor
+        # Fecha sockets de escuta (principal + extras do SO_REUSEPORT)
+        for listener in getattr(self, "_listeners", []) or ([self.server_socket] if self.server_socket else []):
+            try:
+                listener.close()
+            except Exception:
+                pass
         if self.server_socket:
-            self.server_socket.close()
             self.logger.info("Socket do servidor fechado")
             
         # Limpa recursos dos handlers
         self.camera_handler.cleanup()
-        
+
         self.logger.info("Shutdown completado")
 
+        # Drena e encerra a thread de logging por último, depois do log final
+        if getattr(self, "_log_listener", None) is not None:
+            try:
+                self._log_listener.stop()
+            except Exception:
+                pass
+
 
 def main():
     """Função principal para executar o servidor."""